@@ -6,65 +6,372 @@ SQL Learning Tool - Interactive SQL Practice
 Works with your db00.sql warehouse database
 """
 
+import queue
 import sqlite3
 import sys
+from contextlib import contextmanager
 from datetime import datetime
 
-class SQLLearner:
-    def __init__(self, db_path="db00.sql"):
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # prompt_toolkit is optional; fall back to input()
+    PromptSession = None
+
+# Rows pulled from the cursor per fetchmany() call when printing results
+FETCH_CHUNK = 1000
+
+# Applied on connect: WAL journal, memory-mapped reads and a larger page cache
+# keep repeated lesson queries off the read() syscall path
+CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA cache_size=-131072;",
+    "PRAGMA temp_store=MEMORY;",
+)
+
+# Indexes backing the JOIN/WHERE/GROUP BY columns used by the lessons
+LESSON_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_orders_item_id ON orders(item_id);",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_category ON inventory(category);",
+)
+
+
+def configure_connection(conn):
+    """Apply CONNECT_PRAGMAS to a freshly opened connection"""
+    # One at a time, so e.g. WAL failing on a read-only DB doesn't skip the
+    # cache/mmap settings that would still work
+    for pragma in CONNECT_PRAGMAS:
+        try:
+            conn.execute(pragma)
+        except sqlite3.OperationalError as e:
+            print(f"⚠ Could not apply {pragma.rstrip(';')}: {e}")
+
+
+class ConnectionPool:
+    """A fixed set of pre-opened, pre-configured connections to one database.
+
+    Useful when SQLLearner is wrapped in a server and several learners run
+    queries at once: connections stay open (and their page caches warm)
+    instead of being opened and closed per request.
+    """
+
+    def __init__(self, db_path, size=4):
         self.db_path = db_path
+        self._pool = queue.Queue(maxsize=size)
+        self._connections = []
+        for _ in range(size):
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            configure_connection(conn)
+            self._connections.append(conn)
+            self._pool.put(conn)
+
+    def acquire(self):
+        """Take a connection out of the pool, waiting if none are free"""
+        return self._pool.get()
+
+    def release(self, conn):
+        """Return a connection, rolling back anything left uncommitted"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._pool.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, returning it to the pool afterwards"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close every connection in the pool, including borrowed ones"""
+        for conn in self._connections:
+            _optimize_and_close(conn)
+        self._connections.clear()
+
+
+def _optimize_and_close(conn):
+    """Run PRAGMA optimize (best effort) and close the connection"""
+    try:
+        conn.execute("PRAGMA optimize;")
+    except sqlite3.OperationalError:
+        # Read-only DB - nothing to refresh
+        pass
+    finally:
+        conn.close()
+
+
+def _opens_transaction(query):
+    """True for statements that start a transaction the user controls"""
+    return query.lstrip()[:9].upper().startswith(("BEGIN", "SAVEPOINT"))
+
+
+# Lesson queries, built once at import so every run reuses the same string
+
+# Lesson 1: Basic SELECT
+_Q1 = "SELECT * FROM inventory LIMIT 5;"
+
+# Lesson 2: WHERE clause
+_Q2 = """
+SELECT item_name, quantity_in_stock, reorder_level
+FROM inventory
+WHERE quantity_in_stock < reorder_level;
+"""
+
+# Lesson 3: ORDER BY
+_Q3 = """
+SELECT item_name, sale_price
+FROM inventory
+ORDER BY sale_price DESC
+LIMIT 5;
+"""
+
+# Lesson 4: Aggregate functions
+_Q4 = """
+SELECT
+    COUNT(*) as total_items,
+    SUM(quantity_in_stock) as total_stock,
+    AVG(sale_price) as avg_price,
+    MAX(sale_price) as highest_price,
+    MIN(sale_price) as lowest_price
+FROM inventory;
+"""
+
+# Lesson 5: GROUP BY
+_Q5 = """
+SELECT
+    category,
+    COUNT(*) as item_count,
+    AVG(sale_price) as avg_price
+FROM inventory
+GROUP BY category
+ORDER BY item_count DESC;
+"""
+
+# Lesson 6: JOINs
+_Q6 = """
+SELECT
+    i.item_name,
+    o.customer_name,
+    o.quantity_ordered,
+    o.total_price
+FROM orders o
+JOIN inventory i ON o.item_id = i.item_id
+LIMIT 5;
+"""
+
+# Lesson 7: Subqueries
+# (NOT EXISTS needs no DISTINCT and probes idx_orders_item_id per item)
+_Q7 = """
+SELECT i.item_name, i.quantity_in_stock
+FROM inventory i
+WHERE NOT EXISTS (SELECT 1 FROM orders o WHERE o.item_id = i.item_id);
+"""
+
+# Lesson 8: CASE statements
+_Q8 = """
+SELECT
+    item_name,
+    sale_price,
+    CASE
+        WHEN sale_price < 10 THEN 'Budget'
+        WHEN sale_price < 50 THEN 'Mid-range'
+        ELSE 'Premium'
+    END as price_category
+FROM inventory
+LIMIT 10;
+"""
+
+# Lesson 9: Window functions
+_Q9 = """
+SELECT
+    item_name,
+    category,
+    sale_price - cost_price as profit,
+    RANK() OVER (PARTITION BY category ORDER BY sale_price - cost_price DESC) as profit_rank
+FROM inventory
+ORDER BY category, profit_rank;
+"""
+
+# Lesson 10: CTEs
+# (the CTE is used once, so SQLite inlines it into a single scan of
+# inventory; the orders join uses idx_orders_item_id from LESSON_INDEXES)
+_Q10 = """
+WITH profitable_items AS (
+    SELECT
+        item_id,
+        item_name,
+        sale_price - cost_price as profit
+    FROM inventory
+    WHERE sale_price - cost_price > 20
+)
+SELECT
+    pi.item_name,
+    pi.profit,
+    COUNT(o.order_id) as times_ordered
+FROM profitable_items pi
+LEFT JOIN orders o ON pi.item_id = o.item_id
+GROUP BY pi.item_id, pi.item_name, pi.profit
+ORDER BY profit DESC;
+"""
+
+
+class SQLLearner:
+    def __init__(self, db_path="db00.sql", pool=None):
+        self.db_path = pool.db_path if pool is not None else db_path
+        self.pool = pool
         self.conn = None
         self.cursor = None
+        # True while a transaction the user opened with BEGIN/SAVEPOINT is
+        # active; execute_query leaves those for the user to COMMIT/ROLLBACK
+        self._user_transaction = False
+
+        # Lesson number -> method, built once; index 0 is unused so the
+        # lesson number can be used directly
+        self._lesson_table = (
+            None,
+            self.lesson_basic_select,
+            self.lesson_where_clause,
+            self.lesson_order_by,
+            self.lesson_aggregates,
+            self.lesson_group_by,
+            self.lesson_joins,
+            self.lesson_subqueries,
+            self.lesson_case,
+            self.lesson_window_functions,
+            self.lesson_cte,
+        )
 
     def connect(self):
         """Connect to the database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            if self.pool is None:
+                self.conn = sqlite3.connect(self.db_path)
+                configure_connection(self.conn)
+            else:
+                # Keep one pooled connection for the whole session so
+                # multi-statement transactions stay on the same connection
+                self.conn = self.pool.acquire()
             self.cursor = self.conn.cursor()
             print(f"✓ Connected to {self.db_path}\n")
+            self._ensure_indexes()
+            self._analyze_once()
             return True
         except sqlite3.Error as e:
             print(f"✗ Error connecting to database: {e}")
+            # Don't hold on to a half-set-up connection (or a pool slot)
+            if self.conn is not None:
+                if self.pool is not None:
+                    self.pool.release(self.conn)
+                else:
+                    self.conn.close()
+            self.conn = None
+            self.cursor = None
             return False
 
+    def _ensure_indexes(self):
+        """Create the lesson indexes if their tables exist"""
+        for statement in LESSON_INDEXES:
+            try:
+                self.cursor.executescript(statement)
+            except sqlite3.OperationalError:
+                # Table missing (or DB read-only) - lessons still work, just slower
+                pass
+
+    def _analyze_once(self):
+        """Gather planner statistics the first time this database is opened"""
+        # sqlite_stat1 only exists once ANALYZE has run on this DB
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1';"
+        )
+        if self.cursor.fetchone() is None:
+            try:
+                self.cursor.execute("ANALYZE;")
+                self.conn.commit()
+            except sqlite3.OperationalError:
+                # Read-only DB - the planner falls back to its defaults
+                pass
+
     def close(self):
         """Close database connection"""
-        if self.conn:
-            self.conn.close()
+        if self.conn and self.pool is not None:
+            # The pool is owned (and closed) by whoever created it
+            self.pool.release(self.conn)
+            self.conn = None
+        elif self.conn:
+            _optimize_and_close(self.conn)
             print("\n✓ Database connection closed")
 
     def execute_query(self, query):
         """Execute a SQL query and display results"""
         try:
             self.cursor.execute(query)
+            if _opens_transaction(query):
+                self._user_transaction = True
 
-            # Check if it's a SELECT query
-            if query.strip().upper().startswith('SELECT'):
-                results = self.cursor.fetchall()
-                columns = [description[0] for description in self.cursor.description]
-
-                if not results:
-                    print("No results found.\n")
-                    return
-
-                # Print header
-                header = " | ".join(f"{col:20}" for col in columns)
-                print(header)
-                print("-" * len(header))
-
-                # Print rows
-                for row in results:
-                    print(" | ".join(f"{str(val):20}" for val in row))
-
-                print(f"\n({len(results)} row(s) returned)\n")
+            # Statements that return rows (SELECT, WITH ... SELECT, PRAGMA,
+            # EXPLAIN) have a description; INSERT/UPDATE/DELETE do not
+            if self.cursor.description:
+                self._print_results()
             else:
                 # For INSERT, UPDATE, DELETE
-                self.conn.commit()
                 print(f"✓ Query executed. {self.cursor.rowcount} row(s) affected.\n")
 
+            # Commit the transaction sqlite3 opened for this statement
+            # (including row-returning DML like INSERT ... RETURNING), but
+            # leave one the user started with BEGIN open until their
+            # COMMIT or ROLLBACK
+            if self.conn.in_transaction and not self._user_transaction:
+                self.conn.commit()
+
+        except sqlite3.Error as e:
+            print(f"✗ SQL Error: {e}\n")
+            # A failed DML statement leaves sqlite3's implicit BEGIN open;
+            # roll it back so later statements still get committed
+            if self.conn.in_transaction and not self._user_transaction:
+                self.conn.rollback()
+
+        # COMMIT/END/ROLLBACK (or SQLite aborting on an error) ended the
+        # user's transaction
+        if not self.conn.in_transaction:
+            self._user_transaction = False
+
+    def _run_select(self, query):
+        """Execute a query known to return rows and display them"""
+        try:
+            self.cursor.execute(query)
+            self._print_results()
         except sqlite3.Error as e:
             print(f"✗ SQL Error: {e}\n")
 
+    def _print_results(self):
+        """Print the result set of the last executed query"""
+        columns = [description[0] for description in self.cursor.description]
+        rows = self.cursor.fetchmany(FETCH_CHUNK)
+
+        if not rows:
+            print("No results found.\n")
+            return
+
+        # One %-format shared by header and rows; cells are padded and cut
+        # to 20 characters so long values don't break the alignment
+        fmt = " | ".join(["%-20.20s"] * len(columns)) + "\n"
+
+        # Print header
+        header = fmt % tuple(columns)
+        sys.stdout.write(header + "-" * (len(header) - 1) + "\n")
+
+        # Print rows one chunk at a time, one write per chunk
+        count = 0
+        while rows:
+            count += len(rows)
+            sys.stdout.write("".join([fmt % row for row in rows]))
+            rows = self.cursor.fetchmany(FETCH_CHUNK)
+
+        print(f"\n({count} row(s) returned)\n")
+
     def show_tables(self):
         """Show all tables in the database"""
         query = "SELECT name FROM sqlite_master WHERE type='table';"
@@ -99,21 +406,8 @@ class SQLLearner:
 
     def run_lesson(self, lesson_num):
         """Run a specific lesson"""
-        lessons = {
-            1: self.lesson_basic_select,
-            2: self.lesson_where_clause,
-            3: self.lesson_order_by,
-            4: self.lesson_aggregates,
-            5: self.lesson_group_by,
-            6: self.lesson_joins,
-            7: self.lesson_subqueries,
-            8: self.lesson_case,
-            9: self.lesson_window_functions,
-            10: self.lesson_cte
-        }
-
-        if lesson_num in lessons:
-            lessons[lesson_num]()
+        if 1 <= lesson_num < len(self._lesson_table):
+            self._lesson_table[lesson_num]()
         else:
             print("Invalid lesson number!")
 
@@ -122,9 +416,8 @@ class SQLLearner:
         print("=== LESSON 1: Basic SELECT ===")
         print("Goal: Retrieve all items from inventory\n")
 
-        query = "SELECT * FROM inventory LIMIT 5;"
-        print(f"Query: {query}\n")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q1 + "\n\n")
+        self._run_select(_Q1)
 
         print("Try it yourself: SELECT item_name, sale_price FROM inventory;")
 
@@ -132,13 +425,8 @@ class SQLLearner:
         print("=== LESSON 2: WHERE Clause ===")
         print("Goal: Filter items with low stock\n")
 
-        query = """
-        SELECT item_name, quantity_in_stock, reorder_level
-        FROM inventory
-        WHERE quantity_in_stock < reorder_level;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q2 + "\n")
+        self._run_select(_Q2)
 
         print("Try: Find items in category 'Tools'")
 
@@ -146,14 +434,8 @@ class SQLLearner:
         print("=== LESSON 3: ORDER BY ===")
         print("Goal: Sort items by price\n")
 
-        query = """
-        SELECT item_name, sale_price
-        FROM inventory
-        ORDER BY sale_price DESC
-        LIMIT 5;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q3 + "\n")
+        self._run_select(_Q3)
 
         print("Try: Sort by profit margin (sale_price - cost_price)")
 
@@ -161,17 +443,8 @@ class SQLLearner:
         print("=== LESSON 4: Aggregate Functions ===")
         print("Goal: Calculate totals and averages\n")
 
-        query = """
-        SELECT
-            COUNT(*) as total_items,
-            SUM(quantity_in_stock) as total_stock,
-            AVG(sale_price) as avg_price,
-            MAX(sale_price) as highest_price,
-            MIN(sale_price) as lowest_price
-        FROM inventory;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q4 + "\n")
+        self._run_select(_Q4)
 
         print("Try: Calculate total inventory value (quantity * sale_price)")
 
@@ -179,17 +452,8 @@ class SQLLearner:
         print("=== LESSON 5: GROUP BY ===")
         print("Goal: Aggregate by category\n")
 
-        query = """
-        SELECT
-            category,
-            COUNT(*) as item_count,
-            AVG(sale_price) as avg_price
-        FROM inventory
-        GROUP BY category
-        ORDER BY item_count DESC;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q5 + "\n")
+        self._run_select(_Q5)
 
         print("Try: GROUP BY supplier to see supplier statistics")
 
@@ -197,18 +461,8 @@ class SQLLearner:
         print("=== LESSON 6: JOINs ===")
         print("Goal: Combine inventory and orders\n")
 
-        query = """
-        SELECT
-            i.item_name,
-            o.customer_name,
-            o.quantity_ordered,
-            o.total_price
-        FROM orders o
-        JOIN inventory i ON o.item_id = i.item_id
-        LIMIT 5;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q6 + "\n")
+        self._run_select(_Q6)
 
         print("Try: Find total quantity ordered per item")
 
@@ -216,13 +470,8 @@ class SQLLearner:
         print("=== LESSON 7: Subqueries ===")
         print("Goal: Find items that have never been ordered\n")
 
-        query = """
-        SELECT item_name, quantity_in_stock
-        FROM inventory
-        WHERE item_id NOT IN (SELECT DISTINCT item_id FROM orders);
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q7 + "\n")
+        self._run_select(_Q7)
 
         print("Try: Find items with above-average price")
 
@@ -230,20 +479,8 @@ class SQLLearner:
         print("=== LESSON 8: CASE Statements ===")
         print("Goal: Categorize items by price range\n")
 
-        query = """
-        SELECT
-            item_name,
-            sale_price,
-            CASE
-                WHEN sale_price < 10 THEN 'Budget'
-                WHEN sale_price < 50 THEN 'Mid-range'
-                ELSE 'Premium'
-            END as price_category
-        FROM inventory
-        LIMIT 10;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q8 + "\n")
+        self._run_select(_Q8)
 
         print("Try: Create stock status (Low/Medium/High)")
 
@@ -251,17 +488,8 @@ class SQLLearner:
         print("=== LESSON 9: Window Functions ===")
         print("Goal: Rank items by profit within each category\n")
 
-        query = """
-        SELECT
-            item_name,
-            category,
-            sale_price - cost_price as profit,
-            RANK() OVER (PARTITION BY category ORDER BY sale_price - cost_price DESC) as profit_rank
-        FROM inventory
-        ORDER BY category, profit_rank;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q9 + "\n")
+        self._run_select(_Q9)
 
         print("Try: Use ROW_NUMBER() to number all items")
 
@@ -269,26 +497,8 @@ class SQLLearner:
         print("=== LESSON 10: CTEs (Common Table Expressions) ===")
         print("Goal: Use WITH clause for readable queries\n")
 
-        query = """
-        WITH profitable_items AS (
-            SELECT
-                item_id,
-                item_name,
-                sale_price - cost_price as profit
-            FROM inventory
-            WHERE sale_price - cost_price > 20
-        )
-        SELECT
-            pi.item_name,
-            pi.profit,
-            COUNT(o.order_id) as times_ordered
-        FROM profitable_items pi
-        LEFT JOIN orders o ON pi.item_id = o.item_id
-        GROUP BY pi.item_id, pi.item_name, pi.profit
-        ORDER BY profit DESC;
-        """
-        print(f"Query: {query}")
-        self.execute_query(query)
+        sys.stdout.write("Query: " + _Q10 + "\n")
+        self._run_select(_Q10)
 
         print("Try: Create a CTE for low stock items and join with orders")
 
@@ -298,23 +508,32 @@ class SQLLearner:
         print("Type your SQL queries (end with semicolon)")
         print("Type 'exit' to return to main menu\n")
 
-        query_buffer = ""
+        # prompt_toolkit adds line editing and history when it's installed and
+        # we're on a real terminal; piped input keeps using input()
+        if PromptSession is not None and sys.stdin.isatty():
+            read_line = PromptSession().prompt
+        else:
+            read_line = input
+
+        # Collect lines in a list and join once per statement so long pasted
+        # scripts don't pay for repeated string concatenation
+        buf = []
         while True:
             try:
-                line = input("SQL> " if not query_buffer else "...> ")
+                line = read_line("SQL> " if not buf else "...> ")
 
                 if line.strip().lower() == 'exit':
                     break
 
-                query_buffer += " " + line
+                buf.append(line)
 
                 if line.strip().endswith(';'):
-                    self.execute_query(query_buffer.strip())
-                    query_buffer = ""
+                    self.execute_query(" ".join(buf).strip())
+                    buf.clear()
 
             except KeyboardInterrupt:
                 print("\nUse 'exit' to quit interactive mode")
-                query_buffer = ""
+                buf.clear()
 
     def main_menu(self):
         """Display main menu and handle user input"""
@@ -1,8 +1,19 @@
 import sqlite3
 
+
+def _configure(conn):
+    """Apply PRAGMAs for faster bulk writes on the file-backed DB."""
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-65536;")
+
+
 # Persistent DB
 DB_FILE = "mini_aw.sqlite"
 con = sqlite3.connect(DB_FILE)
+con.isolation_level = None  # autocommit; transactions are opened explicitly
+_configure(con)
 cur = con.cursor()
 
 # Territory table
@@ -36,41 +47,47 @@ CREATE TABLE IF NOT EXISTS SalesOrderHeader(
 );
 """)
 
-# Insert Territories
+# Insert sample data (only if tables empty), all in one transaction
 cur.execute("SELECT COUNT(*) FROM Territory;")
-if cur.fetchone()[0] == 0:
-    territories = [
-        (1, "Northwest", "United States"),
-        (2, "Northeast", "United States"),
-        (3, "Central", "United States"),
-        (4, "Canada", "Canada"),
-        (5, "France", "France")
-    ]
-    cur.executemany("INSERT INTO Territory VALUES (?, ?, ?)", territories)
-
-# Insert Customers
+seed_territories = cur.fetchone()[0] == 0
 cur.execute("SELECT COUNT(*) FROM Customer;")
-if cur.fetchone()[0] == 0:
-    customers = [
-        (1, "John", "Smith", 4),
-        (2, "Marie", "Dubois", 5),
-        (3, "Alex", "Johnson", 1),
-        (4, "Robert", "King", 4)
-    ]
-    cur.executemany("INSERT INTO Customer VALUES (?, ?, ?, ?)", customers)
-
-# Insert Orders
+seed_customers = cur.fetchone()[0] == 0
 cur.execute("SELECT COUNT(*) FROM SalesOrderHeader;")
-if cur.fetchone()[0] == 0:
-    orders = [
-        (1001, 1, "2024-01-05", 120.50),
-        (1002, 2, "2024-01-01", 89.99),
-        (1003, 4, "2024-02-01", 220.00),
-        (1004, 2, "2024-03-03", 150.00)
-    ]
-    cur.executemany("INSERT INTO SalesOrderHeader VALUES (?, ?, ?, ?)", orders)
+seed_orders = cur.fetchone()[0] == 0
+
+cur.execute("BEGIN IMMEDIATE;")
+try:
+    if seed_territories:
+        territories = [
+            (1, "Northwest", "United States"),
+            (2, "Northeast", "United States"),
+            (3, "Central", "United States"),
+            (4, "Canada", "Canada"),
+            (5, "France", "France")
+        ]
+        cur.executemany("INSERT INTO Territory VALUES (?, ?, ?)", territories)
+
+    if seed_customers:
+        customers = [
+            (1, "John", "Smith", 4),
+            (2, "Marie", "Dubois", 5),
+            (3, "Alex", "Johnson", 1),
+            (4, "Robert", "King", 4)
+        ]
+        cur.executemany("INSERT INTO Customer VALUES (?, ?, ?, ?)", customers)
 
-con.commit()
+    if seed_orders:
+        orders = [
+            (1001, 1, "2024-01-05", 120.50),
+            (1002, 2, "2024-01-01", 89.99),
+            (1003, 4, "2024-02-01", 220.00),
+            (1004, 2, "2024-03-03", 150.00)
+        ]
+        cur.executemany("INSERT INTO SalesOrderHeader VALUES (?, ?, ?, ?)", orders)
+    cur.execute("COMMIT;")
+except sqlite3.Error:
+    cur.execute("ROLLBACK;")
+    raise
 
 # Demo query
 rows = cur.execute("""
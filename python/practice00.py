@@ -7,10 +7,30 @@ from sqlite3 import Error
 # In SQLite, the database is a single file on disk.
 # If the file doesn't exist, it will be created automatically.
 
+# SQL used by the CRUD helpers below. Keeping them as module-level constants
+# means sqlite3 sees the exact same string every call and reuses the
+# prepared statement from its cache instead of re-parsing it.
+INSERT_SQL = """
+INSERT INTO products (name, category, quantity, price, in_stock)
+VALUES (?, ?, ?, ?, ?);
+"""
+UPDATE_SQL = "UPDATE products SET quantity = ? WHERE id = ?;"
+DELETE_SQL = "DELETE FROM products WHERE id = ?;"
+
+
+class CachedCursorConnection(sqlite3.Connection):
+    """Connection that keeps one long-lived cursor for the hot CRUD paths."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursor = self.cursor()
+
+
 def create_connection(db_name="warehouse_basics.db"):
     """Create a connection to the SQLite database."""
     try:
-        conn = sqlite3.connect(db_name)
+        conn = sqlite3.connect(db_name, cached_statements=256,
+                               factory=CachedCursorConnection)
         print(f"✅ Connected to {db_name} (SQLite version {sqlite3.sqlite_version})")
         return conn
     except Error as e:
@@ -51,16 +71,21 @@ def create_tables(conn):
 
 def insert_product(conn, name, category, quantity, price, in_stock=1):
     """Insert a new product into the products table."""
-    sql = """
-    INSERT INTO products (name, category, quantity, price, in_stock)
-    VALUES (?, ?, ?, ?, ?);
-    """
-    cursor = conn.cursor()
-    cursor.execute(sql, (name, category, quantity, price, in_stock))
+    conn._cursor.execute(INSERT_SQL, (name, category, quantity, price, in_stock))
     conn.commit()
     print(f"🆕 Inserted: {name} ({category}) - {quantity} units @ ${price}")
 
 
+def insert_products(conn, rows):
+    """Insert many products at once in a single transaction.
+
+    Each row is a (name, category, quantity, price, in_stock) tuple.
+    """
+    with conn:
+        conn._cursor.executemany(INSERT_SQL, rows)
+    print(f"🆕 Inserted {len(rows)} products")
+
+
 # ===========================================
 # 4. READ DATA (R = READ)
 # ===========================================
@@ -71,13 +96,17 @@ def show_all_products(conn):
     """Select and print all products."""
     sql = "SELECT id, name, category, quantity, price, in_stock FROM products;"
     cursor = conn.cursor()
+    cursor.arraysize = 1000  # rows per fetchmany() batch
     cursor.execute(sql)
-    rows = cursor.fetchall()
     
     print("\n📦 Current Products:")
     print("-" * 50)
-    for row in rows:
-        print(row)
+    while True:
+        rows = cursor.fetchmany()
+        if not rows:
+            break
+        for row in rows:
+            print(row)
     print("-" * 50)
 
 
@@ -88,9 +117,7 @@ def show_all_products(conn):
 
 def update_quantity(conn, product_id, new_quantity):
     """Update the quantity of a specific product."""
-    sql = "UPDATE products SET quantity = ? WHERE id = ?;"
-    cursor = conn.cursor()
-    cursor.execute(sql, (new_quantity, product_id))
+    conn._cursor.execute(UPDATE_SQL, (new_quantity, product_id))
     conn.commit()
     print(f"🔄 Updated product ID {product_id} to quantity = {new_quantity}")
 
@@ -102,9 +129,7 @@ def update_quantity(conn, product_id, new_quantity):
 
 def delete_product(conn, product_id):
     """Delete a product by its ID."""
-    sql = "DELETE FROM products WHERE id = ?;"
-    cursor = conn.cursor()
-    cursor.execute(sql, (product_id,))
+    conn._cursor.execute(DELETE_SQL, (product_id,))
     conn.commit()
     print(f"🗑️ Deleted product ID {product_id}")
 
@@ -168,11 +193,14 @@ def main():
 
     create_tables(conn)
 
-    # Insert sample data
-    insert_product(conn, "Widget A", "Widgets", 50, 2.99)
-    insert_product(conn, "Widget B", "Widgets", 20, 3.99)
-    insert_product(conn, "Gadget X", "Gadgets", 15, 7.49)
-    insert_product(conn, "Gadget Y", "Gadgets", 0, 5.99, in_stock=0)
+    # Insert sample data (one executemany, one commit)
+    sample = [
+        ("Widget A", "Widgets", 50, 2.99, 1),
+        ("Widget B", "Widgets", 20, 3.99, 1),
+        ("Gadget X", "Gadgets", 15, 7.49, 1),
+        ("Gadget Y", "Gadgets", 0, 5.99, 0),
+    ]
+    insert_products(conn, sample)
 
     show_all_products(conn)
 
@@ -11,34 +11,53 @@ Author: Your friendly AI tutor 😎
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional; fall back to NumPy below
+    njit = None
+
+
+# Numeric column transforms. With Numba installed the loop is JIT-compiled
+# (and cached on disk, so the compile cost is only paid once); otherwise the
+# same work is done with a single vectorized NumPy call.
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _bonus(salary, out):
+        for i in prange(salary.shape[0]):
+            out[i] = salary[i] * 0.10
+else:
+    def _bonus(salary, out):
+        np.multiply(salary, 0.10, out=out)
+
+
 # -----------------------
 # 1. CONNECT TO DATABASE
 # -----------------------
 print("Setting up SQLite database...")
 conn = sqlite3.connect(":memory:")  # in-memory; use 'data.db' to save to file
+conn.isolation_level = None  # autocommit; bulk inserts open their own transaction
 cursor = conn.cursor()
 
 
 # -----------------------
 # 2. CREATE TABLES
 # -----------------------
-cursor.execute("""
+conn.executescript("""
 CREATE TABLE employees (
     id INTEGER PRIMARY KEY,
     name TEXT NOT NULL,
     department TEXT,
     salary REAL,
     hire_date TEXT
-)
-""")
+);
 
-cursor.execute("""
 CREATE TABLE departments (
     dept_id INTEGER PRIMARY KEY,
     dept_name TEXT
-)
+);
 """)
 
 print("Tables created successfully.\n")
@@ -61,9 +80,14 @@ departments_data = [
     (3, 'Finance')
 ]
 
-cursor.executemany("INSERT INTO employees VALUES (?, ?, ?, ?, ?)", employees_data)
-cursor.executemany("INSERT INTO departments VALUES (?, ?)", departments_data)
-conn.commit()
+cursor.execute("BEGIN IMMEDIATE")  # both inserts commit together
+try:
+    cursor.executemany("INSERT INTO employees VALUES (?, ?, ?, ?, ?)", employees_data)
+    cursor.executemany("INSERT INTO departments VALUES (?, ?)", departments_data)
+    cursor.execute("COMMIT")
+except sqlite3.Error:
+    cursor.execute("ROLLBACK")
+    raise
 print("Sample data inserted.\n")
 
 
@@ -71,34 +95,34 @@ print("Sample data inserted.\n")
 # 4. SQL QUERIES PRACTICE
 # -----------------------
 print("SQL Query Examples:\n")
+# SELECTs are read straight into typed DataFrame columns instead of
+# iterating the cursor one tuple at a time; the cursor is kept for DML.
 
 print("All employees:")
-for row in cursor.execute("SELECT * FROM employees"):
-    print(row)
+print(pd.read_sql_query("SELECT * FROM employees", conn,
+                        dtype={'salary': 'float64'}, parse_dates=['hire_date']))
 print()
 
 print("IT department salaries:")
-for row in cursor.execute("SELECT name, salary FROM employees WHERE department = 'IT'"):
-    print(row)
+print(pd.read_sql_query("SELECT name, salary FROM employees WHERE department = 'IT'", conn,
+                        dtype={'salary': 'float64'}))
 print()
 
 print("Average salary per department:")
-for row in cursor.execute("""
+print(pd.read_sql_query("""
     SELECT department, AVG(salary) AS avg_salary, COUNT(*) AS num_employees
     FROM employees
     GROUP BY department
     HAVING avg_salary > 60000
-"""):
-    print(row)
+""", conn, dtype={'avg_salary': 'float64', 'num_employees': 'int64'}))
 print()
 
 print("Join employees with departments:")
-for row in cursor.execute("""
+print(pd.read_sql_query("""
     SELECT e.name, e.salary, d.dept_name
     FROM employees e
     JOIN departments d ON e.department = d.dept_name
-"""):
-    print(row)
+""", conn, dtype={'salary': 'float64'}))
 print()
 
 
@@ -106,7 +130,8 @@ print()
 # 5. LOAD INTO PANDAS
 # -----------------------
 print("Loading SQL data into Pandas DataFrames...\n")
-df_employees = pd.read_sql_query("SELECT * FROM employees", conn)
+df_employees = pd.read_sql_query("SELECT * FROM employees", conn,
+                                 dtype={'salary': 'float64'}, parse_dates=['hire_date'])
 df_departments = pd.read_sql_query("SELECT * FROM departments", conn)
 
 print("Employees DataFrame:\n", df_employees, "\n")
@@ -167,17 +192,23 @@ print(pd.read_sql_query(query, conn), "\n")
 
 # 2. Add bonus column (Pandas)
 print("2️⃣ Add a 10% bonus column (Pandas):")
-df_employees['bonus'] = df_employees['salary'] * 0.10
+bonus = np.empty(len(df_employees), dtype=np.float64)
+_bonus(df_employees['salary'].to_numpy(dtype=np.float64), bonus)
+df_employees['bonus'] = bonus
 print(df_employees, "\n")
 
 # 3. Join and filter IT employees only (Pandas)
 print("3️⃣ IT employees (joined):")
-print(joined[joined['dept_name'] == 'IT'], "\n")
+# Build the mask once on the raw NumPy array (no index alignment)
+it_mask = joined['dept_name'].to_numpy(copy=False) == 'IT'
+print(joined[it_mask], "\n")
 
 # 4. Average salary for hires after 2020 (Pandas)
 print("4️⃣ Average salary for hires after 2020:")
-df_employees['hire_date'] = pd.to_datetime(df_employees['hire_date'])
-print(df_employees[df_employees['hire_date'] > '2020-12-31']['salary'].mean(), "\n")
+# DataFrame.query evaluates with numexpr (compiled, vectorized) when it's
+# installed and falls back to plain pandas otherwise
+cutoff = pd.Timestamp('2020-12-31')
+print(df_employees.query("hire_date > @cutoff")['salary'].mean(), "\n")
 
 # 5. Handle attempted duplicate insert (already shown above)
 